@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 
 
@@ -77,6 +79,32 @@ class Aircraft:
         self.max_descent_slope = max_descent_slope if max_descent_slope is not None else self.specs["max_descent_slope"]
         self.max_bank_angle = self.specs["max_bank_angle"]
     
+    @property
+    def heading(self):
+        """Cap en degrés (0° = Nord, 90° = Est)"""
+        return self._heading
+    
+    @heading.setter
+    def heading(self, value):
+        """Met à jour le cap et le vecteur direction 2D [sin, cos] mis en cache (lecture seule)"""
+        self._heading = value
+        heading_rad = math.radians(value)
+        direction = np.array([math.sin(heading_rad), math.cos(heading_rad)])
+        direction.flags.writeable = False
+        self.heading_direction = direction
+    
+    @property
+    def max_descent_slope(self):
+        """Pente de descente maximale en degrés (négatif = descente)"""
+        return self._max_descent_slope
+    
+    @max_descent_slope.setter
+    def max_descent_slope(self, value):
+        """Met à jour la pente et les grandeurs dérivées utilisées par le calcul de trajectoire"""
+        self._max_descent_slope = value
+        self.max_descent_slope_rad = math.radians(value)
+        self.descent_slope_tan = abs(math.tan(self.max_descent_slope_rad))
+    
     def get_state(self):
         """
         Retourne l'état actuel de l'avion
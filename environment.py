@@ -2,6 +2,8 @@
 Module de gestion de l'environnement aérien
 """
 
+import math
+
 import numpy as np
 
 
@@ -36,6 +38,46 @@ class Environment:
         # Angle de descente standard pour l'approche finale (3 degrés)
         self.final_approach_angle = 3.0
         
+    @property
+    def airport_position(self):
+        """Position de l'aéroport [x, y, z] en km"""
+        return self._airport_position
+    
+    @airport_position.setter
+    def airport_position(self, value):
+        """Met à jour la position de l'aéroport et la géométrie de piste mise en cache"""
+        self._airport_position = value
+        self._update_runway_geometry()
+    
+    @property
+    def faf_position(self):
+        """Position du FAF [x, y, z] en km"""
+        return self._faf_position
+    
+    @faf_position.setter
+    def faf_position(self, value):
+        """Met à jour la position du FAF et la géométrie de piste mise en cache"""
+        self._faf_position = value
+        self._update_runway_geometry()
+    
+    def _update_runway_geometry(self):
+        """
+        Recalcule l'axe de piste 2D (FAF -> aéroport), sa longueur et sa direction unitaire
+        (lecture seule). Les positions doivent être réaffectées, pas modifiées en place.
+        """
+        if not hasattr(self, '_airport_position') or not hasattr(self, '_faf_position'):
+            return
+        
+        runway_axis = np.array(self._airport_position[:2] - self._faf_position[:2], dtype=float)
+        runway_length = math.hypot(runway_axis[0], runway_axis[1])
+        runway_direction = runway_axis / runway_length if runway_length > 0 else np.zeros(2)
+        runway_axis.flags.writeable = False
+        runway_direction.flags.writeable = False
+        
+        self.runway_axis = runway_axis
+        self.runway_length = runway_length
+        self.runway_direction = runway_direction
+    
     def get_airport_info(self):
         """Retourne les informations sur l'aéroport"""
         return {
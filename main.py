@@ -1,5 +1,6 @@
 
 
+import math
 import tkinter as tk
 from tkinter import ttk, messagebox
 import numpy as np
@@ -12,6 +13,10 @@ from aircraft import Aircraft, AircraftType
 from trajectory_calculator import TrajectoryCalculator
 
 
+# Les trajectoires ne servent qu'à l'affichage : stockage simple précision
+# (les paramètres de vol restent calculés en double précision)
+DISPLAY_DTYPE = np.float32
+
 # Configuration par défaut
 DEFAULT_CONFIG = {
     "environment": {
@@ -53,6 +58,7 @@ class FlightSimulatorGUI:
         self.trajectory = None
         self.trajectory_params = None  
         self.cylinders = []  # Liste des cylindres (obstacles)
+        self.calculator = None  # Calculateur réutilisé (cache des trajectoires)
         
         # Variables pour les simulations multiples
         self.multiple_trajectories = []  # Liste des trajectoires multiples
@@ -1014,10 +1020,8 @@ class FlightSimulatorGUI:
             ax.scatter([self.aircraft.position[0]], [self.aircraft.position[1]], 
                       [self.aircraft.position[2]], c='green', marker='o', s=80, label='Avion')
             if draw_direction_arrow:
-                heading_rad = np.radians(self.aircraft.heading)
                 direction_length = min(self.environment.size_x, self.environment.size_y) * 0.08
-                dx = direction_length * np.sin(heading_rad)
-                dy = direction_length * np.cos(heading_rad)
+                dx, dy = direction_length * self.aircraft.heading_direction
                 ax.quiver(self.aircraft.position[0], self.aircraft.position[1], 
                          self.aircraft.position[2], dx, dy, 0, 
                          color='green', arrow_length_ratio=0.3, linewidth=1.5, alpha=0.7)
@@ -1117,10 +1121,10 @@ class FlightSimulatorGUI:
             for ax, (i1, i2) in zip([self.ax_xy, self.ax_xz, self.ax_yz], [(0,1), (0,2), (1,2)]):
                 ax.scatter(pos[i1], pos[i2], c='green', marker='o', s=100, 
                           label='Avion' if ax == self.ax_xy else None, zorder=5)
-            heading_rad = np.radians(self.aircraft.heading)
             arrow_length = min(self.environment.size_x, self.environment.size_y) * 0.05
-            self.ax_xy.arrow(pos[0], pos[1], arrow_length * np.sin(heading_rad), 
-                           arrow_length * np.cos(heading_rad), head_width=1, head_length=0.5, 
+            arrow_dx, arrow_dy = arrow_length * self.aircraft.heading_direction
+            self.ax_xy.arrow(pos[0], pos[1], arrow_dx, 
+                           arrow_dy, head_width=1, head_length=0.5, 
                            fc='green', ec='green', alpha=0.7, linewidth=2, zorder=4)
         
         # Cylindres
@@ -1472,6 +1476,12 @@ class FlightSimulatorGUI:
         except ValueError as e:
             messagebox.showerror("Erreur", str(e))
             
+    def _get_calculator(self):
+        """Retourne le calculateur de trajectoire, recréé si l'environnement a changé"""
+        if self.calculator is None or self.calculator.environment is not self.environment:
+            self.calculator = TrajectoryCalculator(self.environment)
+        return self.calculator
+    
     def _run_simulation(self):
         """Lance la simulation de trajectoire"""
         
@@ -1485,11 +1495,11 @@ class FlightSimulatorGUI:
         
         try:
             # Calculer la trajectoire selon l'option choisie
-            calculator = TrajectoryCalculator(self.environment)
+            calculator = self._get_calculator()
             
             # Trajectoire avec courbes de Bézier (mode principal)
             self.trajectory, self.trajectory_params = calculator.calculate_trajectory(
-                self.aircraft, self.cylinders
+                self.aircraft, self.cylinders, dtype=DISPLAY_DTYPE
             )
             
             # Mettre à jour les visualisations
@@ -1557,12 +1567,8 @@ class FlightSimulatorGUI:
             # Cap aléatoire
             heading = random.uniform(0, 360)
             
-            position = np.array([x, y, z])
-            
-            # Vérifier distance au FAF dans le plan XY uniquement (>20km)
-            position_xy = np.array([x, y])
-            faf_pos_xy = np.array([faf_pos[0], faf_pos[1]])
-            distance_to_faf_xy = np.linalg.norm(position_xy - faf_pos_xy)
+            # Vérifier distance au FAF dans le plan XY uniquement (>20km), en arithmétique scalaire
+            distance_to_faf_xy = math.hypot(x - faf_pos[0], y - faf_pos[1])
             if distance_to_faf_xy <= 20.0:
                 continue
                 
@@ -1570,7 +1576,7 @@ class FlightSimulatorGUI:
             in_obstacle = False
             for cylinder in self.cylinders:
                 # Distance horizontale au centre du cylindre
-                dist_horizontal = np.sqrt((x - cylinder['x'])**2 + (y - cylinder['y'])**2)
+                dist_horizontal = math.hypot(x - cylinder['x'], y - cylinder['y'])
                 # Vérifier si dans le cylindre (horizontalement et verticalement)
                 if (dist_horizontal <= cylinder['radius'] and z <= cylinder['height']):
                     in_obstacle = True
@@ -1658,11 +1664,11 @@ class FlightSimulatorGUI:
                     max_descent_slope=self.max_descent_slope_var.get() if hasattr(self, 'max_descent_slope_var') else None
                 )
                 
-                calculator = TrajectoryCalculator(self.environment)
+                calculator = self._get_calculator()
                 
                 try:
                     trajectory, trajectory_params = calculator.calculate_trajectory(
-                        temp_aircraft, self.cylinders
+                        temp_aircraft, self.cylinders, dtype=DISPLAY_DTYPE
                     )
                     
                     if trajectory is None:
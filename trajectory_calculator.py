@@ -2,8 +2,32 @@
 Module de calcul de trajectoire optimale
 """
 
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+
 import numpy as np
 from aircraft import Aircraft
+from trajectory_core import (params_core, altitude_profile, slope_profile, bezier_sections,
+                             first_collision)
+
+
+def _clamp(value, lower, upper):
+    """Borne un scalaire entre lower et upper (plus rapide que max(min()) ou np.clip sur un scalaire)"""
+    return lower if value < lower else upper if value > upper else value
+
+
+@lru_cache(maxsize=32)
+def _unit_linspace(n_points):
+    """
+    np.linspace(0, 1, n_points) en lecture seule, mis en cache : les mêmes tailles reviennent
+    souvent (bornes de _sample_count, transition finale vers le FAF).
+    """
+    t = np.linspace(0.0, 1.0, n_points)
+    t.flags.writeable = False
+    return t
 
 
 class TrajectoryCalculator:
@@ -11,78 +35,207 @@ class TrajectoryCalculator:
     Classe pour calculer la trajectoire optimale vers le point FAF
     """
     
+    # Densité d'échantillonnage (points/km) et plafond du nombre de points par segment
+    POINTS_PER_KM = 100
+    TURN_POINTS_PER_KM = 150
+    MAX_POINTS = 2000
+    
+    # Nombre maximal de trajectoires conservées en cache
+    CACHE_SIZE = 64
+    
     def __init__(self, environment):
         """Initialise le calculateur avec l'environnement (aéroport, FAF, obstacles)."""
         self.environment = environment
+        self._cache = {}
         
-    def calculate_trajectory(self, aircraft, cylinders=None):
+    def calculate_trajectory(self, aircraft, cylinders=None, dtype=np.float64):
         """
         Calcule la trajectoire optimale vers le FAF avec courbes de Bézier.
         Mode principal : vol initial dans le cap, virage progressif avec courbes de Bézier pour s'aligner,
         descente progressive et évitement automatique des obstacles.
+        Les résultats sont mis en cache selon l'état de l'avion, de l'environnement et des obstacles.
+        dtype permet de demander un stockage np.float32 quand la trajectoire sert uniquement à l'affichage ;
+        les paramètres de vol sont toujours calculés sur la trajectoire en double précision.
+        """
+        
+        if cylinders is None:
+            cylinders = []
+        
+        return self._calculate_trajectory_cached(aircraft, cylinders, self._cylinders_key(cylinders), dtype)
+    
+    def calculate_trajectories(self, aircrafts, cylinders=None, dtype=np.float64, n_jobs=None):
+        """
+        Calcule les trajectoires de plusieurs avions face aux mêmes obstacles.
+        Les trajectoires n'ont pas toutes le même nombre de points (waypoints d'évitement),
+        on retourne donc une liste de (trajectory, parameters) dans l'ordre des avions.
+        n_jobs > 1 (ou -1 pour tous les coeurs) répartit les calculs absents du cache
+        sur plusieurs processus ; par défaut le calcul reste séquentiel.
         """
         
         if cylinders is None:
             cylinders = []
         
-        start_pos = aircraft.position.copy()
-        faf_pos = self.environment.faf_position.copy()
-        airport_pos = self.environment.airport_position.copy()
+        # Clé des obstacles calculée une seule fois pour tout le lot
+        cylinders_key = self._cylinders_key(cylinders)
         
-        runway_axis = airport_pos[:2] - faf_pos[:2]
-        runway_axis_distance = np.linalg.norm(runway_axis)
+        precomputed = None
+        if n_jobs is not None and n_jobs != 1:
+            precomputed = self._calculate_in_parallel(aircrafts, cylinders, cylinders_key, n_jobs)
         
-        if runway_axis_distance < 0.1:
-            return self._calculate_simple_trajectory(aircraft, start_pos, faf_pos)
+        return [self._calculate_trajectory_cached(aircraft, cylinders, cylinders_key, dtype, precomputed)
+                for aircraft in aircrafts]
+    
+    def _calculate_in_parallel(self, aircrafts, cylinders, cylinders_key, n_jobs):
+        """
+        Calcule en parallèle (un processus par coeur) les trajectoires absentes du cache.
+        Les calculs sont indépendants : l'environnement et les obstacles ne sont que lus,
+        chaque processus reçoit sa copie. Retourne {clé de cache float64: (trajectory, parameters)}.
+        """
+        
+        pending = {}
+        for aircraft in aircrafts:
+            cache_key = (self._trajectory_cache_key(aircraft, cylinders_key), np.dtype(np.float64).str)
+            if cache_key not in self._cache:
+                pending.setdefault(cache_key, aircraft)
+        if len(pending) < 2:
+            return None
+        
+        max_workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+        max_workers = min(max_workers, len(pending))
+        # Calculateur sans cache envoyé aux processus (seul l'environnement est sérialisé)
+        worker = TrajectoryCalculator(self.environment)
+        chunksize = max(1, len(pending) // (4 * max_workers))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = executor.map(worker._calculate_trajectory_uncached, pending.values(),
+                                   repeat(cylinders), chunksize=chunksize)
+            return dict(zip(pending, results))
+    
+    def _store_in_cache(self, cache_key, result):
+        """
+        Enregistre un résultat dans le cache borné (éviction de l'entrée la plus ancienne).
+        Les tableaux (trajectoire et valeurs des paramètres) sont passés en lecture seule :
+        ils sont partagés par tous les appels qui touchent le cache.
+        """
+        trajectory, parameters = result
+        for array in (trajectory, *parameters.values()):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        
+        if len(self._cache) >= self.CACHE_SIZE:
+            # Ordre d'insertion du dict : la première clé est la plus ancienne
+            del self._cache[next(iter(self._cache))]
+        self._cache[cache_key] = result
+    
+    def _calculate_trajectory_cached(self, aircraft, cylinders, cylinders_key, dtype=np.float64,
+                                     precomputed=None):
+        """
+        Retourne la trajectoire depuis le cache ou la calcule et l'y enregistre.
+        precomputed contient éventuellement les résultats float64 déjà calculés en parallèle.
+        """
+        
+        dtype = np.dtype(dtype)
+        cache_key = (self._trajectory_cache_key(aircraft, cylinders_key), dtype.str)
+        cached = self._cache.get(cache_key)
+        if cached is None:
+            if dtype == np.float64:
+                if precomputed is not None and cache_key in precomputed:
+                    cached = precomputed[cache_key]
+                else:
+                    cached = self._calculate_trajectory_uncached(aircraft, cylinders)
+            else:
+                # Conversion de la trajectoire de référence (float64) : en float32 les écarts
+                # entre points voisins (~10 m) perdraient trop de précision pour le cap et le taux de virage
+                trajectory, parameters = self._calculate_trajectory_cached(
+                    aircraft, cylinders, cylinders_key, np.float64, precomputed)
+                if trajectory is not None:
+                    trajectory = trajectory.astype(dtype)
+                cached = (trajectory, parameters)
+            self._store_in_cache(cache_key, cached)
+        
+        trajectory, parameters = cached
+        if trajectory is None:
+            return None, {}
+        # Tableaux en lecture seule partagés avec le cache ; seul le dict est copié
+        return trajectory, parameters.copy()
+    
+    def _cylinders_key(self, cylinders):
+        """Géométrie des obstacles sous forme hashable (partie de la clé de cache)."""
+        return tuple((c['x'], c['y'], c['radius'], c['height']) for c in cylinders)
+    
+    def _trajectory_cache_key(self, aircraft, cylinders_key):
+        """Clé de cache : toutes les entrées qui influencent le calcul de la trajectoire."""
+        return (
+            tuple(aircraft.position), aircraft.heading, aircraft.speed, aircraft.max_descent_slope,
+            tuple(self.environment.faf_position), tuple(self.environment.airport_position),
+            cylinders_key
+        )
+    
+    def _calculate_trajectory_uncached(self, aircraft, cylinders):
+        """Calcul effectif de la trajectoire (sans cache), voir calculate_trajectory."""
+        
+        # Positions utilisées en lecture seule : pas de copie
+        start_pos = aircraft.position
+        faf_pos = self.environment.faf_position
         
-        runway_direction = runway_axis / runway_axis_distance
+        # Géométrie de piste mise en cache par l'environnement
+        if self.environment.runway_length < 0.1:
+            return self._calculate_simple_trajectory(aircraft, start_pos, faf_pos)
         
-        # Direction actuelle de l'avion
-        heading_rad = np.radians(aircraft.heading)
-        current_direction = np.array([np.sin(heading_rad), np.cos(heading_rad)])
+        runway_direction = self.environment.runway_direction
         
-        cos_angle = np.dot(current_direction, runway_direction)
-        angle_to_runway = np.degrees(np.arccos(np.clip(cos_angle, -1.0, 1.0)))
+        # Direction actuelle de l'avion (mise en cache par l'avion)
+        current_direction = aircraft.heading_direction
         
-        horizontal_distance = np.linalg.norm(faf_pos[:2] - start_pos[:2])
+        horizontal_distance = math.hypot(faf_pos[0] - start_pos[0], faf_pos[1] - start_pos[1])
         if horizontal_distance < 0.1:
             return self._vertical_trajectory(aircraft, start_pos, faf_pos)
         
-        intercept_point = self._calculate_runway_intercept_point(
-            start_pos[:2], current_direction, airport_pos[:2], 
-            faf_pos[:2], runway_direction, angle_to_runway
-        )
-        
         # Construire la trajectoire avec courbes de Bézier et évitement d'obstacles
+        # (le virage rejoint directement le FAF, aligné sur l'axe)
         return self._build_trajectory_with_runway_alignment(
-            aircraft, start_pos, intercept_point, faf_pos, 
-            current_direction, runway_direction, cylinders
+            aircraft, start_pos, faf_pos, 
+            current_direction, runway_direction, cylinders, horizontal_distance
         )
     
     
-    def _calculate_simple_trajectory(self, aircraft, start_pos, target_pos):
+    def _calculate_simple_trajectory(self, aircraft, start_pos, target_pos, densify=False):
         """
-        Trajectoire directe en ligne droite avec haute densité de points pour un tracé lisse.
+        Trajectoire directe en ligne droite. Un segment droit est entièrement décrit par ses deux
+        extrémités (matplotlib le trace à l'identique) ; densify=True produit une haute densité
+        de points pour les appelants qui ont besoin de la courbe échantillonnée.
         """
         
+        if not densify:
+            trajectory = np.array([start_pos, target_pos], dtype=np.float64)
+            parameters = self._calculate_parameters(trajectory, aircraft.speed)
+            parameters['n_points'] = 2
+            return trajectory, parameters
+        
         distance_vector = target_pos - start_pos
-        distance = np.linalg.norm(distance_vector)
+        distance = math.hypot(distance_vector[0], distance_vector[1], distance_vector[2])
         
-        # Nombre de points élevé pour trajectoire lisse (min 500 ou 100 points/km)
-        min_points = 500
-        points_per_km = 100
-        n_points = max(min_points, int(distance * points_per_km))
+        # Nombre de points élevé pour trajectoire lisse (min 500, plafonné à MAX_POINTS)
+        n_points = self._sample_count(distance, self.POINTS_PER_KM, 500)
         
-        trajectory = np.zeros((n_points, 3))
-        for i in range(n_points):
-            t = i / (n_points - 1)
-            trajectory[i] = start_pos + t * distance_vector
+        # Remplissage en place d'un tableau préalloué (pas de temporaire par point)
+        t = _unit_linspace(n_points)
+        trajectory = np.empty((n_points, 3))
+        np.multiply(t[:, np.newaxis], distance_vector, out=trajectory)
+        trajectory += start_pos
+        trajectory[-1] = target_pos  # Extrémité exacte (copie élément par élément dans le tampon)
         
         parameters = self._calculate_parameters(trajectory, aircraft.speed)
         parameters['n_points'] = n_points
         
         return trajectory, parameters
     
+    def _sample_count(self, distance, points_per_km, min_points):
+        """
+        Nombre de points pour échantillonner un segment : proportionnel à la distance,
+        borné entre min_points et MAX_POINTS pour ne pas croître indéfiniment.
+        """
+        return _clamp(int(distance * points_per_km), min_points, self.MAX_POINTS)
+    
     def _vertical_trajectory(self, aircraft, start_pos, target_pos):
         """
         Trajectoire purement verticale (déjà au-dessus du FAF)
@@ -105,64 +258,24 @@ class TrajectoryCalculator:
         # Nombre de points élevé pour une descente lisse
         n_points = max(300, int(altitude_diff * 200))
         
-        trajectory = np.zeros((n_points, 3))
-        
         # Utiliser une courbe smooth pour la descente verticale
-        for i in range(n_points):
-            t = i / (n_points - 1)
-            # Fonction smooth (ease-in-out)
-            smooth_t = t * t * (3.0 - 2.0 * t)
-            trajectory[i] = start_pos + smooth_t * (target_pos - start_pos)
+        t = _unit_linspace(n_points)
+        # Fonction smooth (ease-in-out)
+        smooth_t = t * t * (3.0 - 2.0 * t)
+        
+        trajectory = np.empty((n_points, 3))
+        np.multiply(smooth_t[:, np.newaxis], target_pos - start_pos, out=trajectory)
+        trajectory += start_pos
+        trajectory[-1] = target_pos  # Extrémité exacte (copie élément par élément dans le tampon)
         
         parameters = self._calculate_parameters(trajectory, vertical_speed)
         parameters['n_points'] = n_points
         
         return trajectory, parameters
     
-    def _calculate_runway_intercept_point(self, start_pos, current_dir, airport_pos, 
-                                          faf_pos, runway_dir, angle_to_runway):
-        """
-        Calcule le point d'interception optimal sur l'axe piste en projetant la position actuelle
-        et en ajustant selon l'angle et la distance pour un alignement progressif avant le FAF.
-        """
-        
-        # Projection orthogonale de la position actuelle sur l'axe de la piste
-        vec_to_aircraft = start_pos - airport_pos
-        projection_dist = np.dot(vec_to_aircraft, runway_dir)
-        closest_point = airport_pos + projection_dist * runway_dir
-        
-        # Distance perpendiculaire à l'axe
-        perp_distance = np.linalg.norm(start_pos - closest_point)
-        
-        # Distance le long de l'axe jusqu'au FAF
-        runway_length = np.linalg.norm(faf_pos - airport_pos)
-        distance_to_faf_on_axis = runway_length - projection_dist
-        
-        # Calculer la distance nécessaire pour s'aligner progressivement
-        # Plus l'angle est grand, plus on a besoin de distance
-        alignment_distance = max(perp_distance * 2, angle_to_runway * 0.1, 3.0)
-        
-        # Le point d'interception doit être JUSTE AVANT le FAF
-        # On veut que l'avion soit aligné en arrivant au FAF
-        # Donc on positionne l'interception à FAF - petite marge de sécurité
-        safety_margin = 0.5  # 500m avant le FAF pour être bien aligné
-        target_projection = runway_length - safety_margin
-        
-        # Mais si on est trop loin, on prend un point intermédiaire
-        # pour permettre un alignement plus progressif
-        if projection_dist < runway_length * 0.3:
-            # Si on est loin en arrière, on vise 80-95% du chemin
-            target_projection = min(
-                projection_dist + alignment_distance,
-                runway_length * 0.95
-            )
-        
-        intercept_point = airport_pos + target_projection * runway_dir
-        
-        return intercept_point
-    
-    def _build_trajectory_with_runway_alignment(self, aircraft, start_pos, intercept_point, 
-                                                 faf_pos, current_dir, runway_dir, cylinders=None):
+    def _build_trajectory_with_runway_alignment(self, aircraft, start_pos, faf_pos, 
+                                                 current_dir, runway_dir, cylinders=None,
+                                                 total_distance_to_faf=None):
         """
         Construit une trajectoire en 2 phases : vol initial dans le cap puis virage progressif
         jusqu'au FAF avec alignement sur l'axe piste, gestion altitude/pente et évitement d'obstacles.
@@ -171,15 +284,20 @@ class TrajectoryCalculator:
         if cylinders is None:
             cylinders = []
         
-        total_distance_to_faf = np.linalg.norm(faf_pos[:2] - start_pos[:2])
-        initial_flight_dist = np.clip(total_distance_to_faf * 0.20, 1.0, 5.0)
+        # Obstacles convertis une seule fois en tableau (x, y, rayon, hauteur) pour l'évitement et la collision
+        cylinder_array = self._cylinder_array(cylinders) if cylinders else None
+        
+        if total_distance_to_faf is None:
+            total_distance_to_faf = math.hypot(faf_pos[0] - start_pos[0], faf_pos[1] - start_pos[1])
+        initial_flight_dist = _clamp(total_distance_to_faf * 0.20, 1.0, 5.0)
         initial_end_point = start_pos[:2] + current_dir * initial_flight_dist
         
         altitude_start, altitude_end = start_pos[2], faf_pos[2]
         altitude_diff = altitude_end - altitude_start
-        max_descent_slope_rad = np.radians(aircraft.max_descent_slope)
-        min_descent_distance = abs(altitude_diff / np.tan(abs(max_descent_slope_rad)))
-        transition_distance = max(min(min_descent_distance * 0.50, 12.0), 3.0)
+        # Tangente de la pente maximale (mise en cache par l'avion)
+        descent_tan = aircraft.descent_slope_tan
+        min_descent_distance = abs(altitude_diff / descent_tan)
+        transition_distance = _clamp(min_descent_distance * 0.50, 3.0, 12.0)
         total_descent_distance = min_descent_distance + transition_distance
         
         if total_descent_distance >= total_distance_to_faf:
@@ -190,26 +308,13 @@ class TrajectoryCalculator:
             level_flight_distance = total_distance_to_faf - total_descent_distance
             descent_distance = min_descent_distance
         
-        # Construire les segments
-        segments = []
-        
-        # Segment 1: Vol initial en ligne droite
-        n_initial = max(50, int(initial_flight_dist * 100))
-        initial_segment = np.zeros((n_initial, 3))
-        for i in range(n_initial):
-            t = i / (n_initial - 1)
-            pos_2d = start_pos[:2] + t * initial_flight_dist * current_dir
-            initial_segment[i] = [pos_2d[0], pos_2d[1], start_pos[2]]
-        
-        segments.append(initial_segment)
-        
-        # Segment 2: Virage progressif jusqu'au FAF avec évitement d'obstacles
+        # Waypoints du virage progressif jusqu'au FAF avec évitement d'obstacles
         # Détecter les obstacles sur le trajet et créer des waypoints de contournement
         waypoints_2d = [initial_end_point]
         
         if cylinders:
             avoidance_waypoints = self._calculate_avoidance_waypoints(
-                initial_end_point, faf_pos[:2], cylinders, start_pos[2]
+                initial_end_point, faf_pos[:2], cylinder_array, start_pos[2]
             )
             waypoints_2d.extend(avoidance_waypoints)
         
@@ -219,124 +324,82 @@ class TrajectoryCalculator:
         altitude_start = start_pos[2]
         altitude_end = faf_pos[2]
         
-        for wp_idx in range(len(waypoints_2d) - 1):
-            wp_start = waypoints_2d[wp_idx]
-            wp_end = waypoints_2d[wp_idx + 1]
-            
-            segment_distance = np.linalg.norm(wp_end - wp_start)
-            n_segment = max(100, int(segment_distance * 150))
-            
-            # Direction entre waypoints
-            seg_dir = (wp_end - wp_start) / segment_distance if segment_distance > 0.01 else np.array([1, 0])
-            
-            # Points de contrôle pour cette section
-            P0_seg = wp_start
-            P3_seg = wp_end
-            
-            # Si c'est le premier segment, utiliser la direction initiale
-            if wp_idx == 0:
-                P1_seg = P0_seg + current_dir * (segment_distance * 0.35)
-            else:
-                # Direction du segment précédent pour continuité tangente
-                prev_dir = (wp_start - waypoints_2d[wp_idx - 1])
-                if np.linalg.norm(prev_dir) > 0.01:
-                    prev_dir = prev_dir / np.linalg.norm(prev_dir)
-                else:
-                    prev_dir = seg_dir
-                P1_seg = P0_seg + prev_dir * (segment_distance * 0.35)
-            
-            # Si c'est le dernier segment, utiliser la direction finale (runway)
-            if wp_idx == len(waypoints_2d) - 2:
-                P2_seg = P3_seg - runway_dir * (segment_distance * 0.35)
-            else:
-                # Direction vers le prochain waypoint pour continuité
-                next_dir = (waypoints_2d[wp_idx + 2] - wp_end)
-                if np.linalg.norm(next_dir) > 0.01:
-                    next_dir = next_dir / np.linalg.norm(next_dir)
-                else:
-                    next_dir = seg_dir
-                P2_seg = P3_seg - next_dir * (segment_distance * 0.35)
-            
-            # Courbe de Bézier pour ce segment
-            segment_array = np.zeros((n_segment, 3))
-            total_distance = np.linalg.norm(faf_pos[:2] - initial_end_point)
-            dist_so_far = sum([np.linalg.norm(waypoints_2d[i+1] - waypoints_2d[i]) 
-                              for i in range(wp_idx)])
-            
-            for i in range(n_segment):
-                t_local = i / (n_segment - 1)
-                # Position 2D avec Bézier cubique
-                pos_2d = ((1-t_local)**3 * P0_seg + 
-                         3*(1-t_local)**2*t_local * P1_seg + 
-                         3*(1-t_local)*t_local**2 * P2_seg + 
-                         t_local**3 * P3_seg)
-                
-                # ALTITUDE avec respect de la pente maximale
-                # Distance parcourue depuis le début du virage (après vol initial)
-                current_distance = dist_so_far + t_local * segment_distance
-                
-                if current_distance < level_flight_distance:
-                    # Phase 1: Vol en palier
-                    altitude = altitude_start
-                    
-                elif current_distance < level_flight_distance + transition_distance:
-                    # Phase 2: Transition ULTRA-progressive avec super-smoothstep (septième degré)
-                    transition_progress = (current_distance - level_flight_distance) / transition_distance
-                    
-                    # Super-smoothstep (7ème degré) : dérivées 1ère ET 2ème nulles aux extrémités
-                    # f(t) = -20t^7 + 70t^6 - 84t^5 + 35t^4
-                    # Cette fonction garantit une transition IMPERCEPTIBLE
-                    t = transition_progress
-                    smooth_t = -20*t**7 + 70*t**6 - 84*t**5 + 35*t**4
-                    
-                    # Altitude descend progressivement pendant la transition
-                    transition_altitude_drop = (transition_distance * abs(np.tan(max_descent_slope_rad)))
-                    altitude = altitude_start - smooth_t * transition_altitude_drop
-                    
-                else:
-                    # Phase 3: Descente linéaire avec pente maximale
-                    descent_progress = current_distance - level_flight_distance - transition_distance
-                    transition_altitude_drop = (transition_distance * abs(np.tan(max_descent_slope_rad)))
-                    descent_altitude_drop = descent_progress * abs(np.tan(max_descent_slope_rad))
-                    
-                    altitude = altitude_start - transition_altitude_drop - descent_altitude_drop
-                    
-                    # S'assurer qu'on ne descend pas en dessous du FAF
-                    altitude = max(altitude, altitude_end)
-                
-                segment_array[i] = [pos_2d[0], pos_2d[1], altitude]
-            
-            segments.append(segment_array)
+        # Longueur et direction unitaire de toutes les sections en un seul calcul (normalisation par lot)
+        waypoints = np.array(waypoints_2d)
+        section_vectors = np.diff(waypoints, axis=0)
+        section_distances = np.hypot(section_vectors[:, 0], section_vectors[:, 1])
+        valid_sections = section_distances > 0.01
+        section_dirs = np.empty_like(section_vectors)
+        section_dirs[:] = (1.0, 0.0)  # Direction par défaut des sections dégénérées
+        np.divide(section_vectors, section_distances[:, np.newaxis], out=section_dirs,
+                  where=valid_sections[:, np.newaxis])
+        
+        # Échantillonnage de chaque section : paramètres t concaténés et section de chaque point
+        section_counts = np.array([self._sample_count(d, self.TURN_POINTS_PER_KM, 100)
+                                   for d in section_distances])
+        t_values = np.concatenate([_unit_linspace(n) for n in section_counts])
+        point_sections = np.repeat(np.arange(len(section_counts)), section_counts)
+        section_offsets = np.concatenate(([0.0], np.cumsum(section_distances)[:-1]))
+        
+        # Tampon unique pour toute la trajectoire (tailles des segments connues à l'avance)
+        n_initial = self._sample_count(initial_flight_dist, self.POINTS_PER_KM, 50)
+        n_turn = len(t_values)
+        trajectory = np.empty((n_initial + n_turn, 3))
+        
+        # Segment 1: Vol initial en ligne droite (produit extérieur distances x direction)
+        initial_distances = np.linspace(0.0, initial_flight_dist, n_initial)
+        trajectory[:n_initial, :2] = start_pos[:2] + initial_distances[:, np.newaxis] * current_dir
+        trajectory[:n_initial, 2] = start_pos[2]
+        
+        # ALTITUDE avec respect de la pente maximale : un seul profil pour toute la phase de virage
+        # Distance parcourue depuis le début du virage (après vol initial)
+        current_distances = t_values * section_distances[point_sections]
+        current_distances += section_offsets[point_sections]
+        trajectory[n_initial:, 2] = self._calculate_altitude_profile(
+            current_distances, altitude_start, altitude_end,
+            level_flight_distance, transition_distance, descent_tan
+        )
         
-        # Combiner tous les segments
-        trajectory = np.vstack(segments)
+        # Segment 2: Virage progressif (courbes de Bézier de toutes les sections en un seul appel)
+        # Tangentes de continuité : direction de la section voisine (cap initial au début,
+        # axe piste à la fin), ou de la section elle-même si la voisine est dégénérée
+        entry_dirs = np.empty_like(section_dirs)
+        entry_dirs[0] = current_dir
+        entry_dirs[1:] = np.where(valid_sections[:-1, np.newaxis], section_dirs[:-1], section_dirs[1:])
+        exit_dirs = np.empty_like(section_dirs)
+        exit_dirs[-1] = runway_dir
+        exit_dirs[:-1] = np.where(valid_sections[1:, np.newaxis], section_dirs[1:], section_dirs[:-1])
+        
+        # Points de contrôle de chaque section
+        handle_lengths = (section_distances * 0.35)[:, np.newaxis]
+        P0 = waypoints[:-1]
+        P3 = waypoints[1:]
+        P1 = P0 + entry_dirs * handle_lengths
+        P2 = P3 - exit_dirs * handle_lengths
+        
+        # Noyau numérique (compilé si Numba est disponible)
+        trajectory[n_initial:, :2] = bezier_sections(P0, P1, P2, P3, t_values, section_counts)
         
         # S'assurer que le dernier point est exactement au FAF avec transition douce
         # Faire une transition douce sur les derniers points vers le FAF
         n_smooth_final = min(100, len(trajectory) // 20)  # Points pour transition finale
-        if n_smooth_final > 0:
-            for i in range(n_smooth_final):
-                idx = len(trajectory) - n_smooth_final + i
-                if idx >= 0:
-                    t = i / (n_smooth_final - 1)
-                    # Transition progressive vers FAF en position ET en altitude
-                    trajectory[idx][:2] = (1 - t) * trajectory[idx][:2] + t * faf_pos[:2]
-                    trajectory[idx][2] = (1 - t) * trajectory[idx][2] + t * faf_pos[2]
+        if n_smooth_final > 1:
+            # Transition progressive vers FAF en position ET en altitude (mélange en place sur la fin)
+            weights = _unit_linspace(n_smooth_final)[:, np.newaxis]
+            tail = trajectory[-n_smooth_final:]
+            tail *= 1.0 - weights
+            tail += weights * faf_pos
         
         # Dernière position exactement au FAF
         trajectory[-1] = faf_pos
         
-        if cylinders:
-            has_collision, colliding_indices, first_collision_idx = self._check_trajectory_collision(trajectory, cylinders)
-            
-            if has_collision:
-                return None, {}
-        
-        n_turn_points = len(trajectory) - len(initial_segment)
+        # Seule l'existence d'une collision compte ici : parcours arrêté au premier point en collision
+        if cylinders and first_collision(trajectory, cylinder_array) >= 0:
+            return None, {}
         
         parameters = self._calculate_parameters(trajectory, aircraft.speed)
-        parameters['intercept_point'] = faf_pos[:2]  # Le point d'interception est maintenant le FAF
-        parameters['initial_segment_end'] = len(initial_segment)
+        parameters['intercept_point'] = faf_pos[:2].copy()  # Le point d'interception est maintenant le FAF
+        parameters['initial_segment_end'] = n_initial
         parameters['turn_segment_end'] = len(trajectory)  # Le virage se termine au FAF
         parameters['runway_alignment'] = True  # Marqueur pour l'affichage
         parameters['n_points'] = len(trajectory)
@@ -344,6 +407,17 @@ class TrajectoryCalculator:
         return trajectory, parameters
     
     
+    def _calculate_altitude_profile(self, distances, altitude_start, altitude_end,
+                                    level_flight_distance, transition_distance, descent_tan):
+        """
+        Calcule l'altitude pour chaque distance parcourue selon les 3 phases :
+        vol en palier, transition super-smoothstep puis descente linéaire à pente maximale.
+        Le calcul est délégué au noyau numérique (compilé si Numba est disponible).
+        """
+        
+        return altitude_profile(distances, altitude_start, altitude_end,
+                                level_flight_distance, transition_distance, descent_tan)
+    
     def _calculate_parameters(self, trajectory, speed):
         """
         Calcule les paramètres de vol (temps, altitude, pente, cap, taux de virage) à partir
@@ -352,33 +426,16 @@ class TrajectoryCalculator:
         
         n_points = len(trajectory)
         
-        # Calculer les distances parcourues
-        distances = np.zeros(n_points)
-        for i in range(1, n_points):
-            distances[i] = distances[i-1] + np.linalg.norm(trajectory[i] - trajectory[i-1])
-        
-        # Temps (en secondes)
-        total_distance = distances[-1]
-        if total_distance > 0:
-            flight_time_hours = total_distance / speed
-            time_array = np.linspace(0, flight_time_hours * 3600, n_points)
-        else:
-            time_array = np.zeros(n_points)
+        # Distances, temps et pente (coeurs numériques, compilés si Numba est disponible)
+        distances, time_array, total_distance = params_core(trajectory, speed)
+        slope_array = slope_profile(trajectory)
+        flight_time_hours = total_distance / speed
         
-        # Altitude
+        # Altitude (vue sur la trajectoire, pas de copie)
         altitude_array = trajectory[:, 2]
         
-        # Vitesse (constante)
-        speed_array = np.full(n_points, speed)
-        
-        # Calculer la pente (en degrés) - vectorisé
-        slope_array = np.zeros(n_points)
-        if n_points > 1:
-            dz = np.diff(trajectory[:, 2])  # Différences d'altitude
-            dx = np.linalg.norm(np.diff(trajectory[:, :2], axis=0), axis=1)  # Distances horizontales
-            slope_array[1:] = np.where(dx > 0, np.degrees(np.arctan(dz / dx)), 
-                                       np.where(dz != 0, np.where(dz > 0, 90.0, -90.0), 0.0))
-            slope_array[0] = slope_array[1]
+        # Vitesse (constante) : vue diffusée en lecture seule, aucune allocation de n_points valeurs
+        speed_array = np.broadcast_to(np.float64(speed), (n_points,))
         
         # Calculer l'angle de cap (heading) - vectorisé
         heading_array = np.zeros(n_points)
@@ -388,27 +445,33 @@ class TrajectoryCalculator:
             heading_array[1:] = np.where(heading_array[1:] < 0, heading_array[1:] + 360, heading_array[1:])
             heading_array[0] = heading_array[1]
         
-        # Calculer le taux de virage - vectorisé avec lissage
+        # Calculer le taux de virage - vectorisé avec lissage sur une fenêtre de temps
+        # Les pas de temps suivent l'espacement réel des points (très petits aux jonctions de sections
+        # et vers le FAF) : le taux est la variation de cap sur la fenêtre divisée par sa durée,
+        # et non une moyenne de rapports Δcap/Δt point à point qui exploseraient sur ces pas minuscules
         turn_rate_array = np.zeros(n_points)
-        if n_points > 1:
-            delta_time = np.diff(time_array)
-            delta_heading = np.diff(heading_array)
-            # Gestion passage 0°/360°
-            delta_heading = np.where(delta_heading > 180, delta_heading - 360, delta_heading)
-            delta_heading = np.where(delta_heading < -180, delta_heading + 360, delta_heading)
-            turn_rate_array[1:] = np.where(delta_time > 0, delta_heading / delta_time, 0.0)
-            turn_rate_array[0] = turn_rate_array[1]
+        if n_points > 1 and time_array[-1] > 0:
+            # Points quasi confondus écartés (cap non défini sur un déplacement horizontal nul)
+            keep = np.empty(n_points, dtype=bool)
+            keep[0] = True
+            keep[1:] = np.hypot(dxy[:, 0], dxy[:, 1]) > 1e-6
+            kept_time = time_array[keep]
+            # Cap déroulé (continu au passage 0°/360°)
+            kept_heading = np.unwrap(heading_array[keep], period=360.0)
             
-            # Lissage du taux de virage avec une moyenne mobile pour éliminer les pics
-            # Utilisation d'une fenêtre adaptative selon le nombre de points
-            window_size = max(5, min(51, n_points // 20))  # Fenêtre entre 5 et 51 points (doit être impair)
+            # Fenêtre adaptative : même durée que l'ancienne moyenne mobile sur 5 à 51 points à pas constant
+            window_size = _clamp(n_points // 20, 5, 51)
             if window_size % 2 == 0:
                 window_size += 1
+            half_window = 0.5 * window_size * time_array[-1] / (n_points - 1)
             
-            # Application d'un filtre moyenneur
-            if n_points > window_size:
-                from scipy.ndimage import uniform_filter1d
-                turn_rate_array = uniform_filter1d(turn_rate_array, size=window_size, mode='nearest')
+            # Variation de cap entre les bornes de la fenêtre centrée (tronquée aux extrémités)
+            window_start = np.maximum(time_array - half_window, 0.0)
+            window_end = np.minimum(time_array + half_window, time_array[-1])
+            heading_change = np.interp(window_end, kept_time, kept_heading)
+            heading_change -= np.interp(window_start, kept_time, kept_heading)
+            np.divide(heading_change, window_end - window_start, out=turn_rate_array,
+                      where=window_end > window_start)
         
         return {
             'time': time_array,
@@ -423,123 +486,90 @@ class TrajectoryCalculator:
     
     
     
-    def _calculate_avoidance_waypoints(self, start_2d, end_2d, cylinders, altitude):
+    def _calculate_avoidance_waypoints(self, start_2d, end_2d, cylinder_array, altitude):
         """
         Détecte les obstacles sur le segment et génère des waypoints de contournement tangents
         (approche latérale en longeant le périmètre) pour chaque obstacle traversé.
+        cylinder_array contient les obstacles en colonnes (x, y, rayon, hauteur) ; tous les
+        obstacles sont traités en une seule passe vectorisée, les waypoints restent dans leur ordre.
         """
-        waypoints = []
         safety_margin = 0.5  # Marge de sécurité réduite pour longer le cylindre
         
         # Direction du trajet
         traj_vec = end_2d - start_2d
-        traj_dist = np.linalg.norm(traj_vec)
+        traj_dist = math.hypot(traj_vec[0], traj_vec[1])
         
         if traj_dist < 0.01:
-            return waypoints
+            return []
         
         traj_dir = traj_vec / traj_dist
         
-        for cylinder in cylinders:
-            if altitude > cylinder['height'] + 0.5:  # Marge aussi sur l'altitude
-                continue  # Pas de collision possible si on vole au-dessus
-            
-            cyl_center = np.array([cylinder['x'], cylinder['y']])
-            cyl_radius = cylinder['radius'] + safety_margin
-            
-            # Vérifier si le segment traverse le cylindre
-            # Projeter le centre du cylindre sur la ligne start-end
-            to_cyl = cyl_center - start_2d
-            proj_length = np.dot(to_cyl, traj_dir)
-            
-            # Si la projection est hors du segment, pas de collision
-            if proj_length < 0 or proj_length > traj_dist:
-                continue
-            
-            # Point le plus proche sur le segment
-            closest_point = start_2d + proj_length * traj_dir
-            dist_to_segment = np.linalg.norm(cyl_center - closest_point)
-            
-            # Si le cylindre est trop proche, créer des waypoints de contournement
-            if dist_to_segment < cyl_radius:
-                
-                # Vecteur perpendiculaire à la trajectoire
-                perp = np.array([-traj_dir[1], traj_dir[0]])
-                
-                # Déterminer le côté de contournement optimal
-                # On choisit le côté qui minimise la déviation
-                vec_to_cyl = cyl_center - start_2d
-                cross_product = vec_to_cyl[0] * traj_dir[1] - vec_to_cyl[1] * traj_dir[0]
-                side = 1 if cross_product > 0 else -1
-                
-                # Calculer la distance avant/après le cylindre pour placer les waypoints
-                # Approche tangente : distance réduite pour longer le cylindre
-                approach_distance = max(cyl_radius * 0.8, 1.0)  # Distance d'approche réduite
-                
-                # Points d'entrée et de sortie sur la trajectoire directe
-                entry_pos_on_traj = proj_length - approach_distance
-                exit_pos_on_traj = proj_length + approach_distance
-                
-                # S'assurer qu'on reste dans le segment
-                entry_pos_on_traj = max(0, entry_pos_on_traj)
-                exit_pos_on_traj = min(traj_dist, exit_pos_on_traj)
-                
-                # Points de base sur la trajectoire
-                entry_base = start_2d + entry_pos_on_traj * traj_dir
-                exit_base = start_2d + exit_pos_on_traj * traj_dir
-                
-                # Décaler perpendiculairement pour contourner
-                # Décalage juste suffisant pour éviter le cylindre (on longe le périmètre)
-                offset_distance = (cylinder['radius'] - dist_to_segment) + safety_margin  # On compense la distance manquante + marge
-                
-                entry_point = entry_base + side * perp * offset_distance
-                exit_point = exit_base + side * perp * offset_distance
-                
-                dist_entry = np.linalg.norm(entry_point - cyl_center)
-                dist_exit = np.linalg.norm(exit_point - cyl_center)
-                min_safe_distance = cylinder['radius'] + safety_margin
-                if dist_entry < min_safe_distance:
-                    entry_point = cyl_center + (entry_point - cyl_center) / dist_entry * min_safe_distance
-                if dist_exit < min_safe_distance:
-                    exit_point = cyl_center + (exit_point - cyl_center) / dist_exit * min_safe_distance
-                
-                waypoints.append(entry_point)
-                waypoints.append(exit_point)
-                
-               
-        return waypoints
-    
-    def _check_collision_with_cylinder(self, point, cylinder):
-        """
-        Teste si un point 3D est à l'intérieur d'un cylindre (distance horizontale ≤ rayon ET altitude ≤ hauteur).
-        """
-        # Distance horizontale au centre du cylindre
-        dx = point[0] - cylinder['x']
-        dy = point[1] - cylinder['y']
-        horizontal_dist = np.sqrt(dx**2 + dy**2)
-        
-        # Vérifier si dans le rayon et sous la hauteur
-        return (horizontal_dist <= cylinder['radius'] and 
-                0 <= point[2] <= cylinder['height'])
-    
-    def _check_trajectory_collision(self, trajectory, cylinders):
-        """
-        Parcourt toute la trajectoire et détecte les collisions avec les cylindres.
-        Retourne la liste des cylindres en collision et l'index du premier point de collision.
-        """
-        if not cylinders:
-            return False, [], -1
-        
-        colliding_cylinders = []
-        first_collision_idx = -1
-        
-        for i, point in enumerate(trajectory):
-            for cyl_idx, cylinder in enumerate(cylinders):
-                if self._check_collision_with_cylinder(point, cylinder):
-                    if cyl_idx not in colliding_cylinders:
-                        colliding_cylinders.append(cyl_idx)
-                    if first_collision_idx == -1:
-                        first_collision_idx = i
-        
-        return len(colliding_cylinders) > 0, colliding_cylinders, first_collision_idx
+        # Vecteur perpendiculaire à la trajectoire (indépendant de l'obstacle : calculé une fois)
+        perp = np.array([-traj_dir[1], traj_dir[0]])
+        
+        # Vérifier si le segment traverse chaque cylindre
+        # Projeter le centre des cylindres sur la ligne start-end
+        centers = cylinder_array[:, :2]
+        cylinder_radius = cylinder_array[:, 2]
+        to_cyl = centers - start_2d
+        proj_length = to_cyl[:, 0] * traj_dir[0] + to_cyl[:, 1] * traj_dir[1]
+        
+        # Point le plus proche sur le segment
+        closest_points = start_2d + proj_length[:, np.newaxis] * traj_dir
+        dist_to_segment = np.hypot(centers[:, 0] - closest_points[:, 0], centers[:, 1] - closest_points[:, 1])
+        
+        # Obstacles à contourner : pas survolés (marge aussi sur l'altitude), projection dans le segment
+        # et cylindre trop proche du segment
+        cyl_radius = cylinder_radius + safety_margin
+        to_avoid = ((altitude <= cylinder_array[:, 3] + 0.5)
+                    & (proj_length >= 0) & (proj_length <= traj_dist)
+                    & (dist_to_segment < cyl_radius))
+        if not to_avoid.any():
+            return []
+        
+        centers = centers[to_avoid]
+        cylinder_radius = cylinder_radius[to_avoid]
+        cyl_radius = cyl_radius[to_avoid]
+        to_cyl = to_cyl[to_avoid]
+        proj_length = proj_length[to_avoid]
+        dist_to_segment = dist_to_segment[to_avoid]
+        
+        # Déterminer le côté de contournement optimal
+        # On choisit le côté qui minimise la déviation
+        cross_product = to_cyl[:, 0] * traj_dir[1] - to_cyl[:, 1] * traj_dir[0]
+        side = np.where(cross_product > 0, 1.0, -1.0)
+        
+        # Calculer la distance avant/après le cylindre pour placer les waypoints
+        # Approche tangente : distance réduite pour longer le cylindre
+        approach_distance = np.maximum(cyl_radius * 0.8, 1.0)  # Distance d'approche réduite
+        
+        # Points d'entrée et de sortie sur la trajectoire directe, en restant dans le segment
+        entry_pos_on_traj = np.maximum(0, proj_length - approach_distance)
+        exit_pos_on_traj = np.minimum(traj_dist, proj_length + approach_distance)
+        
+        # Décaler perpendiculairement pour contourner
+        # Décalage juste suffisant pour éviter le cylindre (on longe le périmètre)
+        offset_distance = (cylinder_radius - dist_to_segment) + safety_margin  # On compense la distance manquante + marge
+        offsets = perp * (side * offset_distance)[:, np.newaxis]
+        
+        # Points de base sur la trajectoire, décalés ; paires (entrée, sortie) entrelacées par obstacle
+        waypoints = np.empty((len(centers), 2, 2))
+        waypoints[:, 0] = start_2d + entry_pos_on_traj[:, np.newaxis] * traj_dir
+        waypoints[:, 0] += offsets
+        waypoints[:, 1] = start_2d + exit_pos_on_traj[:, np.newaxis] * traj_dir
+        waypoints[:, 1] += offsets
+        
+        # Ramener sur le cercle de sécurité (rayon + marge) les points encore trop proches du centre
+        from_center = waypoints - centers[:, np.newaxis]
+        distances = np.hypot(from_center[..., 0], from_center[..., 1])
+        min_safe_distance = cyl_radius[:, np.newaxis]
+        too_close = distances < min_safe_distance
+        if too_close.any():
+            rescaled = centers[:, np.newaxis] + from_center / distances[..., np.newaxis] * min_safe_distance[..., np.newaxis]
+            waypoints = np.where(too_close[..., np.newaxis], rescaled, waypoints)
+        
+        return list(waypoints.reshape(-1, 2))
     
+    def _cylinder_array(self, cylinders):
+        """Obstacles en colonnes (x, y, rayon, hauteur) pour les noyaux de détection de collision."""
+        return np.array([(c['x'], c['y'], c['radius'], c['height']) for c in cylinders])
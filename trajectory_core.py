@@ -0,0 +1,372 @@
+"""
+Noyaux numériques du calcul de trajectoire (versions NumPy et compilées avec Numba)
+"""
+
+import numpy as np
+
+# Numba est optionnel : s'il est installé, le coeur numérique est compilé (JIT)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # cache=True a besoin du fichier source du module pour situer le cache ; sans source
+    # (exécutable PyInstaller, .pyc seuls) la décoration lève RuntimeError : versions NumPy
+    def _cache_probe():
+        return 0
+    
+    try:
+        njit(cache=True)(_cache_probe)
+    except RuntimeError:
+        NUMBA_AVAILABLE = False
+
+# Mettre à False pour désactiver la compilation JIT (débogage)
+USE_NUMBA = True
+
+# Nombre de cylindres à partir duquel first_collision passe par une grille spatiale
+# (la boucle compilée reste plus rapide que la grille jusqu'à une centaine de cylindres)
+COLLISION_GRID_MIN_CYLINDERS = 16
+COLLISION_GRID_MIN_CYLINDERS_JIT = 128
+
+
+def _params_core_numpy(trajectory, speed):
+    """
+    Coeur numérique de TrajectoryCalculator._calculate_parameters (version NumPy vectorisée).
+    Retourne (distances cumulées, temps en secondes, distance totale).
+    """
+    
+    # Différences entre points consécutifs
+    diffs = np.diff(trajectory, axis=0)
+    
+    # Calculer les distances parcourues
+    segment_lengths = np.sqrt(np.einsum('ij,ij->i', diffs, diffs))
+    distances = np.empty(len(trajectory))
+    distances[:1] = 0.0
+    np.cumsum(segment_lengths, out=distances[1:])
+    total_distance = distances[-1]
+    
+    # Temps (en secondes) à partir de l'abscisse curviligne (espacement réel des points)
+    time_array = distances * (3600.0 / speed)
+    
+    return distances, time_array, total_distance
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _params_core_jit(trajectory, speed):
+        """Coeur numérique de _calculate_parameters compilé : une seule boucle fusionnée."""
+        
+        n_points = trajectory.shape[0]
+        distances = np.zeros(n_points)
+        
+        for i in range(1, n_points):
+            dx = trajectory[i, 0] - trajectory[i-1, 0]
+            dy = trajectory[i, 1] - trajectory[i-1, 1]
+            dz = trajectory[i, 2] - trajectory[i-1, 2]
+            distances[i] = distances[i-1] + np.sqrt(dx*dx + dy*dy + dz*dz)
+        
+        total_distance = distances[n_points-1] if n_points > 0 else 0.0
+        time_array = distances * (3600.0 / speed)
+        
+        return distances, time_array, total_distance
+
+
+def params_core(trajectory, speed):
+    """Sélectionne la version compilée si Numba est disponible et activé."""
+    if USE_NUMBA and NUMBA_AVAILABLE:
+        return _params_core_jit(np.ascontiguousarray(trajectory, dtype=np.float64), float(speed))
+    return _params_core_numpy(trajectory, speed)
+
+
+def _slope_profile_numpy(trajectory):
+    """Pente (en degrés) entre points consécutifs (version NumPy vectorisée)."""
+    
+    n_points = len(trajectory)
+    slope_array = np.zeros(n_points)
+    if n_points > 1:
+        # arctan2 donne directement ±90° (ou 0°) si dx == 0
+        diffs = np.diff(trajectory, axis=0)
+        dz = diffs[:, 2]  # Différences d'altitude
+        dx = np.hypot(diffs[:, 0], diffs[:, 1])  # Distances horizontales
+        slope_array[1:] = np.degrees(np.arctan2(dz, dx))
+        slope_array[0] = slope_array[1]
+    
+    return slope_array
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _slope_profile_jit(trajectory):
+        """Pente (en degrés) entre points consécutifs compilée : une seule boucle."""
+        
+        n_points = trajectory.shape[0]
+        slope_array = np.zeros(n_points)
+        
+        for i in range(1, n_points):
+            dx = trajectory[i, 0] - trajectory[i-1, 0]
+            dy = trajectory[i, 1] - trajectory[i-1, 1]
+            dz = trajectory[i, 2] - trajectory[i-1, 2]
+            slope_array[i] = np.arctan2(dz, np.sqrt(dx*dx + dy*dy)) * (180.0 / np.pi)
+        if n_points > 1:
+            slope_array[0] = slope_array[1]
+        
+        return slope_array
+
+
+def slope_profile(trajectory):
+    """Sélectionne la version compilée si Numba est disponible et activé."""
+    if USE_NUMBA and NUMBA_AVAILABLE:
+        return _slope_profile_jit(np.ascontiguousarray(trajectory, dtype=np.float64))
+    return _slope_profile_numpy(trajectory)
+
+
+def _altitude_profile_numpy(distances, altitude_start, altitude_end,
+                            level_flight_distance, transition_distance, descent_tan):
+    """
+    Profil d'altitude en 3 phases (version NumPy vectorisée). Les distances étant croissantes,
+    les bornes des phases sont trouvées par recherche dichotomique et chaque phase est une tranche.
+    """
+    
+    transition_altitude_drop = transition_distance * descent_tan
+    transition_end = level_flight_distance + transition_distance
+    level_end, descent_start = np.searchsorted(distances, (level_flight_distance, transition_end))
+    
+    altitudes = np.empty(len(distances))
+    
+    # Phase 1: Vol en palier
+    altitudes[:level_end] = altitude_start
+    
+    # Phase 2: Transition ULTRA-progressive avec super-smoothstep (septième degré)
+    # Super-smoothstep (7ème degré) : dérivées 1ère ET 2ème nulles aux extrémités
+    # f(t) = -20t^7 + 70t^6 - 84t^5 + 35t^4 = t^4 * (35 + t*(-84 + t*(70 - 20t)))  (Horner)
+    t = (distances[level_end:descent_start] - level_flight_distance) / transition_distance
+    t2 = t * t
+    smooth_t = t2 * t2 * (35.0 + t * (-84.0 + t * (70.0 - 20.0 * t)))
+    altitudes[level_end:descent_start] = altitude_start - smooth_t * transition_altitude_drop
+    
+    # Phase 3: Descente linéaire avec pente maximale
+    # S'assurer qu'on ne descend pas en dessous du FAF
+    descent = altitudes[descent_start:]
+    np.subtract(distances[descent_start:], transition_end, out=descent)
+    descent *= -descent_tan
+    descent += altitude_start - transition_altitude_drop
+    np.maximum(descent, altitude_end, out=descent)
+    
+    return altitudes
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _altitude_profile_jit(distances, altitude_start, altitude_end,
+                              level_flight_distance, transition_distance, descent_tan):
+        """Profil d'altitude en 3 phases compilé : une seule boucle, sans tableaux temporaires."""
+        
+        n_points = distances.shape[0]
+        altitudes = np.empty(n_points)
+        transition_altitude_drop = transition_distance * descent_tan
+        transition_end = level_flight_distance + transition_distance
+        
+        for i in range(n_points):
+            d = distances[i]
+            if d < level_flight_distance:
+                altitudes[i] = altitude_start
+            elif d < transition_end:
+                t = (d - level_flight_distance) / transition_distance
+                t2 = t * t
+                smooth_t = t2 * t2 * (35.0 + t * (-84.0 + t * (70.0 - 20.0 * t)))
+                altitudes[i] = altitude_start - smooth_t * transition_altitude_drop
+            else:
+                altitude = altitude_start - transition_altitude_drop - (d - transition_end) * descent_tan
+                altitudes[i] = max(altitude, altitude_end)
+        
+        return altitudes
+
+
+def altitude_profile(distances, altitude_start, altitude_end,
+                     level_flight_distance, transition_distance, descent_tan):
+    """Sélectionne la version compilée si Numba est disponible et activé."""
+    if USE_NUMBA and NUMBA_AVAILABLE:
+        return _altitude_profile_jit(np.ascontiguousarray(distances, dtype=np.float64),
+                                     float(altitude_start), float(altitude_end),
+                                     float(level_flight_distance), float(transition_distance),
+                                     float(descent_tan))
+    return _altitude_profile_numpy(distances, altitude_start, altitude_end,
+                                   level_flight_distance, transition_distance, descent_tan)
+
+
+def _bezier_power_basis(p0, p1, p2, p3):
+    """
+    Coefficients (A, B, C, D) de chaque section dans la base monomiale :
+    B(t) = ((A*t + B)*t + C)*t + D, calculés une fois par section.
+    """
+    
+    a = p3 - 3.0 * p2 + 3.0 * p1 - p0
+    b = 3.0 * p0 - 6.0 * p1 + 3.0 * p2
+    c = 3.0 * (p1 - p0)
+    return a, b, c, p0
+
+
+def _bezier_sections_numpy(p0, p1, p2, p3, t_values, section_counts):
+    """
+    Points de Bézier cubiques 2D successives (une par section, points de contrôle (n_sections, 2)) :
+    schéma de Horner évalué sur tous les t concaténés à la fois.
+    """
+    
+    point_sections = np.repeat(np.arange(len(section_counts)), section_counts)
+    a, b, c, d = _bezier_power_basis(p0, p1, p2, p3)
+    t = t_values[:, np.newaxis]
+    curve = a[point_sections] * t
+    curve += b[point_sections]
+    curve *= t
+    curve += c[point_sections]
+    curve *= t
+    curve += d[point_sections]
+    # Extrémités exactes (t = 1) : les jonctions entre sections restent des points confondus
+    ends = t_values == 1.0
+    curve[ends] = p3[point_sections[ends]]
+    return curve
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _bezier_sections_jit(p0, p1, p2, p3, t_values, section_counts):
+        """Points de Bézier cubiques 2D successives compilés : Horner, une boucle, sans tableaux temporaires."""
+        
+        curve = np.empty((t_values.shape[0], 2))
+        
+        i = 0
+        for s in range(section_counts.shape[0]):
+            # Base monomiale de la section (voir _bezier_power_basis)
+            a0 = p3[s, 0] - 3.0 * p2[s, 0] + 3.0 * p1[s, 0] - p0[s, 0]
+            a1 = p3[s, 1] - 3.0 * p2[s, 1] + 3.0 * p1[s, 1] - p0[s, 1]
+            b0 = 3.0 * p0[s, 0] - 6.0 * p1[s, 0] + 3.0 * p2[s, 0]
+            b1 = 3.0 * p0[s, 1] - 6.0 * p1[s, 1] + 3.0 * p2[s, 1]
+            c0 = 3.0 * (p1[s, 0] - p0[s, 0])
+            c1 = 3.0 * (p1[s, 1] - p0[s, 1])
+            d0 = p0[s, 0]
+            d1 = p0[s, 1]
+            for _ in range(section_counts[s]):
+                t = t_values[i]
+                if t == 1.0:
+                    # Extrémité exacte : les jonctions entre sections restent des points confondus
+                    curve[i, 0] = p3[s, 0]
+                    curve[i, 1] = p3[s, 1]
+                else:
+                    curve[i, 0] = ((a0 * t + b0) * t + c0) * t + d0
+                    curve[i, 1] = ((a1 * t + b1) * t + c1) * t + d1
+                i += 1
+        
+        return curve
+
+
+def bezier_sections(p0, p1, p2, p3, t_values, section_counts):
+    """Sélectionne la version compilée si Numba est disponible et activé."""
+    if USE_NUMBA and NUMBA_AVAILABLE:
+        return _bezier_sections_jit(np.ascontiguousarray(p0, dtype=np.float64),
+                                    np.ascontiguousarray(p1, dtype=np.float64),
+                                    np.ascontiguousarray(p2, dtype=np.float64),
+                                    np.ascontiguousarray(p3, dtype=np.float64),
+                                    np.ascontiguousarray(t_values, dtype=np.float64),
+                                    np.ascontiguousarray(section_counts, dtype=np.int64))
+    return _bezier_sections_numpy(p0, p1, p2, p3, t_values, section_counts)
+
+
+def collision_matrix(points, cylinder_array):
+    """
+    Matrice booléenne points x cylindres (cylinder_array en colonnes x, y, rayon, hauteur) :
+    collision si distance horizontale ≤ rayon ET 0 ≤ altitude ≤ hauteur.
+    """
+    
+    # Comparaison des distances au carré (pas de racine), calculée en place
+    squared_distances = points[:, 0, np.newaxis] - cylinder_array[:, 0]
+    squared_distances *= squared_distances
+    dy = points[:, 1, np.newaxis] - cylinder_array[:, 1]
+    dy *= dy
+    squared_distances += dy
+    altitudes = points[:, 2, np.newaxis]
+    return ((squared_distances <= cylinder_array[:, 2] * cylinder_array[:, 2])
+            & (altitudes >= 0) & (altitudes <= cylinder_array[:, 3]))
+
+
+def _first_collision_numpy(trajectory, cylinder_array, chunk_size=256):
+    """Index du premier point en collision (-1 si aucun), par blocs de points pour s'arrêter au plus tôt."""
+    
+    for start in range(0, len(trajectory), chunk_size):
+        hit_points = collision_matrix(trajectory[start:start + chunk_size], cylinder_array).any(axis=1)
+        if hit_points.any():
+            return start + int(hit_points.argmax())
+    return -1
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _first_collision_jit(trajectory, cylinder_array):
+        """Index du premier point en collision (-1 si aucun) compilé : arrêt dès la première collision."""
+        
+        for i in range(trajectory.shape[0]):
+            z = trajectory[i, 2]
+            if z < 0.0:
+                continue
+            for k in range(cylinder_array.shape[0]):
+                if z <= cylinder_array[k, 3]:
+                    dx = trajectory[i, 0] - cylinder_array[k, 0]
+                    dy = trajectory[i, 1] - cylinder_array[k, 1]
+                    radius = cylinder_array[k, 2]
+                    if dx * dx + dy * dy <= radius * radius:
+                        return i
+        return -1
+
+
+def _first_collision_grid(trajectory, cylinder_array, first_collision_kernel):
+    """
+    Index du premier point en collision via une grille spatiale uniforme : chaque suite de points
+    consécutifs d'une même cellule n'est testée que contre les cylindres des 3x3 cellules voisines.
+    Cellule = 2 x rayon maximal, donc un point en collision est toujours dans une cellule voisine du centre.
+    """
+    
+    cell_size = max(2.0 * cylinder_array[:, 2].max(), 1.0)
+    
+    # Cylindres indexés par la cellule de leur centre
+    grid = {}
+    for cyl_idx, cell in enumerate(np.floor(cylinder_array[:, :2] / cell_size).astype(np.int64).tolist()):
+        grid.setdefault(tuple(cell), []).append(cyl_idx)
+    
+    # Suites de points consécutifs dans la même cellule (parcourues dans l'ordre de la trajectoire)
+    point_cells = np.floor(trajectory[:, :2] / cell_size).astype(np.int64)
+    run_starts = np.flatnonzero((point_cells[1:] != point_cells[:-1]).any(axis=1)) + 1
+    bounds = np.concatenate(([0], run_starts, [len(trajectory)])).tolist()
+    
+    neighbours = {}  # Cylindres voisins de chaque cellule déjà rencontrée
+    for start, end, cell in zip(bounds[:-1], bounds[1:], point_cells[bounds[:-1]].tolist()):
+        cell = tuple(cell)
+        candidates = neighbours.get(cell)
+        if candidates is None:
+            indices = [cyl_idx for di in (-1, 0, 1) for dj in (-1, 0, 1)
+                       for cyl_idx in grid.get((cell[0] + di, cell[1] + dj), ())]
+            candidates = neighbours[cell] = cylinder_array[indices]
+        if len(candidates):
+            hit = first_collision_kernel(trajectory[start:end], candidates)
+            if hit >= 0:
+                return start + hit
+    return -1
+
+
+def first_collision(trajectory, cylinder_array):
+    """
+    Sélectionne la version compilée si Numba est disponible et activé ; à partir du seuil
+    de la version choisie, seuls les cylindres voisins sont testés (grille spatiale).
+    """
+    if USE_NUMBA and NUMBA_AVAILABLE:
+        trajectory = np.ascontiguousarray(trajectory, dtype=np.float64)
+        cylinder_array = np.ascontiguousarray(cylinder_array, dtype=np.float64)
+        first_collision_kernel = _first_collision_jit
+        grid_min_cylinders = COLLISION_GRID_MIN_CYLINDERS_JIT
+    else:
+        first_collision_kernel = _first_collision_numpy
+        grid_min_cylinders = COLLISION_GRID_MIN_CYLINDERS
+    
+    if len(cylinder_array) >= grid_min_cylinders:
+        return _first_collision_grid(trajectory, cylinder_array, first_collision_kernel)
+    return first_collision_kernel(trajectory, cylinder_array)